@@ -1,4 +1,4 @@
-from app import app, db, User
+from app import app, db, User, DEV_COUNSELOR_HASH
 
 def add_counselor():
     with app.app_context():
@@ -16,9 +16,9 @@ def add_counselor():
         counselor = User(
             username='counselor',
             email='counselor@university.edu',
+            password_hash=DEV_COUNSELOR_HASH,
             role='counselor'
         )
-        counselor.set_password('counselor123')
         
         # Add to database
         db.session.add(counselor)
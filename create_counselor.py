@@ -1,5 +1,4 @@
-from app import app, db, User
-from werkzeug.security import generate_password_hash
+from app import app, db, User, DEV_COUNSELOR_HASH
 
 def create_counselor():
     with app.app_context():
@@ -7,15 +6,15 @@ def create_counselor():
         if User.query.filter_by(username='counselor').first():
             print("Counselor user already exists")
             return
-        
-        # Create counselor user with properly hashed password
+
+        # Create counselor user with the cached dev password hash
         counselor = User(
             username='counselor',
             email='counselor@university.edu',
+            password_hash=DEV_COUNSELOR_HASH,
             role='counselor'
         )
-        counselor.set_password('counselor123')
-        
+
         # Add to database
         db.session.add(counselor)
         db.session.commit()
@@ -0,0 +1,15 @@
+# Gunicorn configuration for the Dropout Prediction System
+#
+# The API endpoints are dominated by database I/O, so gevent workers let
+# each process service many concurrent DB-waiting requests instead of one.
+# CPU-heavy batch predictions happen rarely (CSV imports) and still run
+# fine on a greenlet; tune workers down if imports start starving traffic.
+bind = "0.0.0.0:5000"
+workers = 4
+worker_class = "gevent"
+worker_connections = 1000
+timeout = 120
+keepalive = 2
+max_requests = 1000
+max_requests_jitter = 100
+preload_app = True
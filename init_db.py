@@ -4,8 +4,7 @@ Database initialization script for the Dropout Prediction System
 Creates tables with an admin user
 """
 
-from app import app, db, User
-from werkzeug.security import generate_password_hash
+from app import app, db, User, DEV_ADMIN_HASH, DEV_COUNSELOR_HASH
 
 def create_admin_user():
     """Create admin user if it doesn't exist"""
@@ -13,7 +12,7 @@ def create_admin_user():
         admin = User(
             username='admin',
             email='admin@university.edu',
-            password=generate_password_hash('admin123'),
+            password_hash=DEV_ADMIN_HASH,
             role='admin'
         )
         db.session.add(admin)
@@ -27,9 +26,9 @@ def create_counselor():
         counselor = User(
             username='counselor',
             email='counselor@university.edu',
+            password_hash=DEV_COUNSELOR_HASH,
             role='counselor'
         )
-        counselor.set_password('counselor123')
         db.session.add(counselor)
         db.session.commit()
         return ['counselor']
@@ -36,6 +36,13 @@ class DropoutPredictor:
                 "❌ Model not found. Please train it first using train_model.py"
             )
 
+    def warm_up(self):
+        """
+        Run a throwaway batch prediction at startup so the first real
+        request doesn't pay the lazy page-in/dispatch cost of the model
+        """
+        self.predict_batch(np.zeros((1, len(self.feature_names)), dtype=np.float32))
+
     def predict(self, features):
         """
         Predict dropout risk
@@ -44,20 +51,34 @@ class DropoutPredictor:
         Returns:
             (risk_score, risk_category, recommendations)
         """
+        # Single predictions ride the same vectorized path as batches
+        dropout_probs, risk_categories = self.predict_batch(features)
+
+        return float(dropout_probs[0]), str(risk_categories[0]), []
+
+    def predict_batch(self, features):
+        """
+        Predict dropout risk for many students in a single model call
+        Args:
+            features: (N, 34) array-like, one row of feature values per student
+        Returns:
+            (risk_scores, risk_categories) as NumPy arrays of length N
+        """
         if self.model is None or self.scaler is None:
             raise ValueError("Model not loaded")
 
-        features = np.array(features).reshape(1, -1)
+        features = np.asarray(features, dtype=np.float32).reshape(-1, len(self.feature_names))
         features_scaled = self.scaler.transform(features)
-        probabilities = self.model.predict_proba(features_scaled)[0]
+        probabilities = self.model.predict_proba(features_scaled)
 
-        dropout_prob = probabilities[1] if len(probabilities) > 1 else 0
-
-        if dropout_prob >= 0.7:
-            risk_category = "High"
-        elif dropout_prob >= 0.4:
-            risk_category = "Medium"
+        if probabilities.shape[1] > 1:
+            dropout_probs = probabilities[:, 1]
         else:
-            risk_category = "Low"
+            dropout_probs = np.zeros(len(features))
+
+        risk_categories = np.select(
+            [dropout_probs >= 0.7, dropout_probs >= 0.4],
+            ['High', 'Medium'], default='Low'
+        )
 
-        return dropout_prob, risk_category, []
+        return dropout_probs, risk_categories